@@ -5,7 +5,14 @@
 # - Analyst reads JSON, extracts fields, and persists updates via UpdateJobsCsvTool.
 # ==============================================================================
 
+import hashlib
+import shelve
+import threading
+import time
+
 from crewai import Agent, LLM
+from config import APP_CONFIG
+from tools.json_utils import dumpb
 from tools.scraping_tools import ScrapeLinkedInTool
 from tools.workflow_tools import UpdateJobsCsvTool
 
@@ -13,15 +20,112 @@ from tools.workflow_tools import UpdateJobsCsvTool
 linkedin_scraper_tool = ScrapeLinkedInTool()
 update_jobs_csv_tool = UpdateJobsCsvTool()
 
+# On-disk LLM response cache (shelve is not thread-safe -> guard with a lock)
+LLM_CACHE_PATH = str(APP_CONFIG.LOGS_DIR / "llm_cache")
+LLM_CACHE_TTL = 7 * 24 * 60 * 60   # seconds
+_LLM_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(llm, messages) -> str:
+    material = {
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "top_p": getattr(llm, "top_p", None),
+        "max_tokens": getattr(llm, "max_tokens", None),
+        # JSON mode / speculative decoding (extra_body) / endpoint change the output too
+        "response_format": getattr(llm, "response_format", None),
+        "additional_params": getattr(llm, "additional_params", None),
+        "extra_body": getattr(llm, "extra_body", None),
+        "base_url": getattr(llm, "base_url", None),
+        "messages": messages,
+    }
+    return hashlib.blake2b(dumpb(material, sort_keys=True, default=str)).hexdigest()
+
+
+_llm_cache_pruned = False
+
+
+def _prune_llm_cache(db, now: float) -> None:
+    # once per process: entries past LLM_CACHE_TTL, including ones whose key is
+    # never asked for again, so the shelve does not grow without bound
+    global _llm_cache_pruned
+    if _llm_cache_pruned:
+        return
+    _llm_cache_pruned = True
+    for key in [k for k, (ts, _) in db.items() if now - ts >= LLM_CACHE_TTL]:
+        del db[key]
+
+
+def with_response_cache(llm):
+    """
+    Memoize llm's plain-text completions on disk for LLM_CACHE_TTL.
+    Key = blake2b(model, sampling params, response_format, extra request params,
+    base_url, messages); expired entries are dropped. Calls that carry tools,
+    callable functions or a response model bypass the cache.
+
+    Patches the instance instead of subclassing: depending on the crewai
+    version, LLM(...) hands back a native provider class, not LLM itself.
+    """
+    uncached_call = llm.call
+
+    def call(messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if tools or available_functions or kwargs.get("response_model"):
+            return uncached_call(messages, tools=tools, callbacks=callbacks,
+                                 available_functions=available_functions, **kwargs)
+
+        key = _cache_key(llm, messages)
+        now = time.time()
+        with _LLM_CACHE_LOCK, shelve.open(LLM_CACHE_PATH) as db:
+            _prune_llm_cache(db, now)
+            hit = db.get(key)
+            if hit is not None and now - hit[0] >= LLM_CACHE_TTL:
+                del db[key]
+                hit = None
+        if hit is not None:
+            return hit[1]
+
+        response = uncached_call(messages, tools=tools, callbacks=callbacks,
+                                 available_functions=available_functions, **kwargs)
+        if isinstance(response, str) and response:
+            with _LLM_CACHE_LOCK, shelve.open(LLM_CACHE_PATH) as db:
+                db[key] = (now, response)
+        return response
+
+    # object.__setattr__: crewai's LLM is a pydantic model in newer versions
+    object.__setattr__(llm, "call", call)
+    return llm
+
+
 # Local OpenAI-compatible LLM
-local_llm = LLM(
+local_llm = with_response_cache(LLM(
     model="openai/llama-2-7b-chat",
     base_url="http://localhost:8000/v1",
     api_key="not-needed",
     temperature=0.2,
     max_tokens=1024,   # ample room now that your engine is 4k context
     top_p=0.9,
+))
+
+# Analyst output is low-entropy structured JSON: decode greedily with a smaller
+# budget, and optionally let TRT-LLM use speculative decoding.
+_analyst_params = dict(
+    model="openai/llama-2-7b-chat",
+    base_url="http://localhost:8000/v1",
+    api_key="not-needed",
+    temperature=0.0,
+    top_p=1.0,
+    max_tokens=512,
 )
+if APP_CONFIG.LLM_SPECULATIVE_DECODING:
+    _analyst_params["extra_body"] = {"use_speculative_decoding": True}
+analyst_llm = with_response_cache(LLM(**_analyst_params))
+
+# JSON mode only for the tool-less per-job analyst; the tool-using analyst has
+# to emit ReAct text (Thought/Action), which json_object would forbid.
+analyst_json_llm = with_response_cache(LLM(
+    **_analyst_params,
+    **({"response_format": {"type": "json_object"}} if APP_CONFIG.LLM_JSON_MODE else {}),
+))
 
 class JobAgents:
     def research_agent(self):
@@ -46,7 +150,7 @@ class JobAgents:
                 "Do not produce prose; return the tool's JSON output."
             ),
             tools=[linkedin_scraper_tool],
-            verbose=True,              # keep prompts small -> more room for results
+            verbose=APP_CONFIG.CREWAI_VERBOSE,
             allow_delegation=False,
             llm=local_llm,
         )
@@ -68,14 +172,16 @@ class JobAgents:
           }
         }
 
-        Persistence: Use Update Jobs CSV tool with payloads like:
+        Persistence: Use Update Jobs CSV tool once, with a batch payload like:
         {
-          "job_id": "<job_id>",
-          "updates": {
-            "skills_extracted": "...",
-            "seniority_level": "...",
-            "employment_type": "...",
-            "salary_range": "..."
+          "batch": {
+            "<job_id>": {
+              "skills_extracted": "...",
+              "seniority_level": "...",
+              "employment_type": "...",
+              "salary_range": "..."
+            },
+            ...
           }
         }
         """
@@ -85,16 +191,41 @@ class JobAgents:
                 "Read the JSON 'jobs' array from the previous task. "
                 "For each job, extract 'skills_extracted' (comma-separated), and where possible "
                 "'seniority_level', 'employment_type', and 'salary_range'. "
-                "Persist these fields back to the CSV using the 'Update Jobs CSV' tool. "
+                "Persist these fields back to the CSV with one 'Update Jobs CSV' call for all jobs. "
                 "Return a single JSON object mapping job_id -> updates you applied."
             ),
             backstory=(
                 "You analyze structured job rows and enrich them. "
-                "You must persist updates via the helper tool, one call per job_id or in multiple calls. "
+                "You must persist updates via the helper tool in a single call using its 'batch' payload. "
                 "Only output JSON—no markdown or prose."
             ),
             tools=[update_jobs_csv_tool],
-            verbose=False,
+            verbose=APP_CONFIG.CREWAI_VERBOSE,
             allow_delegation=False,
-            llm=local_llm,
+            llm=analyst_llm,
+        )
+
+    def job_analysis_agent(self):
+        """
+        Single-job variant of analysis_agent, used by main.py to analyze jobs
+        concurrently. It has no tools: it returns the updates for one job as JSON,
+        and main.py persists all of them with one batched Update Jobs CSV call.
+        OUTPUT: {"skills_extracted": "...", "seniority_level": "...",
+                 "employment_type": "...", "salary_range": "..."}
+        """
+        return Agent(
+            role="Job Requirements Analyst",
+            goal=(
+                "Read one job posting and extract 'skills_extracted' (comma-separated), and where "
+                "possible 'seniority_level', 'employment_type', and 'salary_range'. "
+                "Return a single JSON object with those fields."
+            ),
+            backstory=(
+                "You analyze one structured job row at a time. "
+                "Only output JSON—no markdown or prose."
+            ),
+            tools=[],
+            verbose=APP_CONFIG.CREWAI_VERBOSE,
+            allow_delegation=False,
+            llm=analyst_json_llm,
         )
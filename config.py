@@ -1,106 +1,157 @@
 import os
+import functools
+from dataclasses import dataclass
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Resolve PROJECT_BASE_DIR early so we can load the right .env
-_THIS_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_BASE_DIR = os.getenv("PROJECT_BASE_DIR", _THIS_DIR)
-ENV_PATH = os.path.join(PROJECT_BASE_DIR, ".env")
+_THIS_DIR = Path(__file__).resolve().parent
+PROJECT_BASE_DIR = Path(os.getenv("PROJECT_BASE_DIR", _THIS_DIR))
+ENV_PATH = PROJECT_BASE_DIR / ".env"
 
 # Load environment variables from .env (prefer project .env, else fallback)
-if os.path.exists(ENV_PATH):
+if ENV_PATH.exists():
     load_dotenv(ENV_PATH)
 else:
     load_dotenv()
 
+@dataclass(frozen=True, slots=True)
 class Config:
     """
     Centralized configuration for the Job Agent and the local TRT-LLM server.
     All defaults mirror your confirmed working setup, with env-var overrides.
+    Values are resolved once in from_env(); the instance is immutable afterwards.
     """
 
     # --- Personal / Credentials (keep secrets in .env)
-    LINKEDIN_EMAIL = os.getenv("LINKEDIN_EMAIL")
-    LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD")
-    HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
-
-    YOUR_NAME = os.getenv("YOUR_NAME", "Unknown")
-    YOUR_EMAIL = os.getenv("YOUR_EMAIL")
-    YOUR_PHONE = os.getenv("YOUR_PHONE")
-    YOUR_LINKEDIN_PROFILE = os.getenv("YOUR_LINKEDIN_PROFILE")
-    YOUR_GITHUB_PROFILE = os.getenv("YOUR_GITHUB_PROFILE")
-    DESIRED_EXPERIENCE_LEVELS = os.getenv("DESIRED_EXPERIENCE_LEVELS")
-    POSTED_WITHIN_DAYS = int(os.getenv("POSTED_WITHIN_DAYS"))
-    DEFAULT_JOB_LOCATION = os.getenv("DEFAULT_JOB_LOCATION")
+    LINKEDIN_EMAIL: str | None
+    LINKEDIN_PASSWORD: str | None
+    HUGGINGFACE_TOKEN: str | None
+
+    YOUR_NAME: str
+    YOUR_EMAIL: str | None
+    YOUR_PHONE: str | None
+    YOUR_LINKEDIN_PROFILE: str | None
+    YOUR_GITHUB_PROFILE: str | None
+    DESIRED_EXPERIENCE_LEVELS: str | None
+    POSTED_WITHIN_DAYS: int
+    DEFAULT_JOB_LOCATION: str | None
 
     # --- OpenAI-compatible LLM endpoint (served by TRT-LLM container)
-    OPENAI_PORT = int(os.getenv("OPENAI_PORT", "8000"))
-    LLM_API_URL = os.getenv(
-        "LLM_API_URL",
-        f"http://localhost:{OPENAI_PORT}/v1/chat/completions"
-    )
+    OPENAI_PORT: int
+    LLM_API_URL: str
+    LLM_JSON_MODE: bool                # response_format=json_object for JSON-only agents
+    LLM_SPECULATIVE_DECODING: bool     # only if the TRT-LLM engine has a draft model
 
     # --- Paths
-    PROJECT_BASE_DIR = os.getenv("PROJECT_BASE_DIR", PROJECT_BASE_DIR)
-    LOGS_DIR = os.path.join(PROJECT_BASE_DIR, "logs")
-    BASE_RESUME_DIR = os.path.join(PROJECT_BASE_DIR, "resumes", "base")
-
-    BASE_RESUME_NAME = os.getenv("BASE_RESUME_NAME", "resume.docx")
-    BASE_RESUME_PATH = os.path.join(BASE_RESUME_DIR, BASE_RESUME_NAME)
+    PROJECT_BASE_DIR: Path
+    LOGS_DIR: Path
+    BASE_RESUME_DIR: Path
+    BASE_RESUME_NAME: str
+    BASE_RESUME_PATH: Path
+    FIREFOX_PROFILE_DIR: Path          # seeded once, cloned per browser
 
     # --- TensorRT-LLM engine/tokenizer paths (standardized)
-    # Prefer ENGINE_DIR/TOKENIZER_DIR; fall back to legacy MODEL_ENGINE_DIR for compatibility.
-    ENGINE_DIR = os.getenv(
-        "ENGINE_DIR",
-        os.getenv("MODEL_ENGINE_DIR", "/mnt/ssd/llm_models/tensorrt_llm_engines/Llama-2-7b-chat-hf-gptq")
-    )
-    TOKENIZER_DIR = os.getenv(
-        "TOKENIZER_DIR",
-        "/mnt/ssd/llm_models/hf_models/Llama-2-7b-chat-hf"
-    )
+    ENGINE_DIR: Path
+    TOKENIZER_DIR: Path
 
     # --- Docker runtime settings for the TRT-LLM container
-    TLLM_IMAGE = os.getenv("TLLM_IMAGE", "dustynv/tensorrt_llm:0.12-r36.4.0")
-    CONTAINER_NAME = os.getenv("CONTAINER_NAME", "trt_llm_server")
-    FORCE_BUILD = os.getenv("FORCE_BUILD", "off")  # 'off' mirrors your working run
+    TLLM_IMAGE: str
+    CONTAINER_NAME: str
+    FORCE_BUILD: str
+
+    # --- Agent workflow
+    ANALYST_CONCURRENCY: int           # max per-job analyst requests in flight
+    CREWAI_VERBOSE: bool               # stream agent/crew steps to the console (debug)
+    WEBDRIVER_POOL_SIZE: int           # warm Firefox instances kept between scrapes
+    HEADLESS_FAST: bool                # Firefox skips images/CSS/autoplay/trackers (0 to debug rendering)
 
     # --- Job search params (unchanged)
-    JOB_SEARCH_KEYWORDS = [
+    JOB_SEARCH_KEYWORDS: tuple[str, ...] = (
         "Data Scientist", "Data Analyst", "Machine Learning Engineer",
         "Business Intelligence", "Data Visualization", "SQL Developer",
-    ]
-    POSTED_WITHIN_DAYS = int(os.getenv("POSTED_WITHIN_DAYS", "7"))
-
-    # --- Directory helpers / validations
-    @staticmethod
-    def ensure_dirs():
-        os.makedirs(Config.LOGS_DIR, exist_ok=True)
-        os.makedirs(Config.BASE_RESUME_DIR, exist_ok=True)
-
-    @staticmethod
-    def verify_paths():
-        if not os.path.isdir(Config.ENGINE_DIR):
-            raise FileNotFoundError(f"ENGINE_DIR does not exist: {Config.ENGINE_DIR}")
-        if not os.path.isdir(Config.TOKENIZER_DIR):
-            raise FileNotFoundError(f"TOKENIZER_DIR does not exist: {Config.TOKENIZER_DIR}")
-
-    @staticmethod
-    def summary():
+    )
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Read every env var exactly once and freeze the resolved values."""
+        base_dir = Path(os.getenv("PROJECT_BASE_DIR", PROJECT_BASE_DIR))
+        resume_dir = base_dir / "resumes" / "base"
+        resume_name = os.getenv("BASE_RESUME_NAME", "resume.docx")
+        openai_port = int(os.getenv("OPENAI_PORT", "8000"))
+        return cls(
+            LINKEDIN_EMAIL=os.getenv("LINKEDIN_EMAIL"),
+            LINKEDIN_PASSWORD=os.getenv("LINKEDIN_PASSWORD"),
+            HUGGINGFACE_TOKEN=os.getenv("HUGGINGFACE_TOKEN"),
+            YOUR_NAME=os.getenv("YOUR_NAME", "Unknown"),
+            YOUR_EMAIL=os.getenv("YOUR_EMAIL"),
+            YOUR_PHONE=os.getenv("YOUR_PHONE"),
+            YOUR_LINKEDIN_PROFILE=os.getenv("YOUR_LINKEDIN_PROFILE"),
+            YOUR_GITHUB_PROFILE=os.getenv("YOUR_GITHUB_PROFILE"),
+            DESIRED_EXPERIENCE_LEVELS=os.getenv("DESIRED_EXPERIENCE_LEVELS"),
+            POSTED_WITHIN_DAYS=int(os.getenv("POSTED_WITHIN_DAYS", "7")),
+            DEFAULT_JOB_LOCATION=os.getenv("DEFAULT_JOB_LOCATION"),
+            OPENAI_PORT=openai_port,
+            LLM_API_URL=os.getenv(
+                "LLM_API_URL",
+                f"http://localhost:{openai_port}/v1/chat/completions"
+            ),
+            LLM_JSON_MODE=os.getenv("LLM_JSON_MODE", "1") == "1",
+            LLM_SPECULATIVE_DECODING=os.getenv("LLM_SPECULATIVE_DECODING", "0") == "1",
+            PROJECT_BASE_DIR=base_dir,
+            LOGS_DIR=base_dir / "logs",
+            BASE_RESUME_DIR=resume_dir,
+            BASE_RESUME_NAME=resume_name,
+            BASE_RESUME_PATH=resume_dir / resume_name,
+            FIREFOX_PROFILE_DIR=Path(os.getenv("FIREFOX_PROFILE_DIR", base_dir / "logs" / "ff-profile")),
+            # Prefer ENGINE_DIR/TOKENIZER_DIR; fall back to legacy MODEL_ENGINE_DIR for compatibility.
+            ENGINE_DIR=Path(os.getenv(
+                "ENGINE_DIR",
+                os.getenv("MODEL_ENGINE_DIR", "/mnt/ssd/llm_models/tensorrt_llm_engines/Llama-2-7b-chat-hf-gptq")
+            )),
+            TOKENIZER_DIR=Path(os.getenv(
+                "TOKENIZER_DIR",
+                "/mnt/ssd/llm_models/hf_models/Llama-2-7b-chat-hf"
+            )),
+            TLLM_IMAGE=os.getenv("TLLM_IMAGE", "dustynv/tensorrt_llm:0.12-r36.4.0"),
+            CONTAINER_NAME=os.getenv("CONTAINER_NAME", "trt_llm_server"),
+            FORCE_BUILD=os.getenv("FORCE_BUILD", "off"),  # 'off' mirrors your working run
+            ANALYST_CONCURRENCY=int(os.getenv("ANALYST_CONCURRENCY", "4")),
+            CREWAI_VERBOSE=os.getenv("CREWAI_VERBOSE", "0") == "1",
+            WEBDRIVER_POOL_SIZE=int(os.getenv("WEBDRIVER_POOL_SIZE", "1")),
+            HEADLESS_FAST=os.getenv("HEADLESS_FAST", "1") == "1",
+        )
+
+    # --- Directory helpers / validations (memoized: paths are frozen, so once is enough)
+    @functools.cache
+    def ensure_dirs(self):
+        self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+        self.BASE_RESUME_DIR.mkdir(parents=True, exist_ok=True)
+
+    @functools.cache
+    def verify_paths(self):
+        if not self.ENGINE_DIR.is_dir():
+            raise FileNotFoundError(f"ENGINE_DIR does not exist: {self.ENGINE_DIR}")
+        if not self.TOKENIZER_DIR.is_dir():
+            raise FileNotFoundError(f"TOKENIZER_DIR does not exist: {self.TOKENIZER_DIR}")
+
+    def summary(self):
         return {
-            "PROJECT_BASE_DIR": Config.PROJECT_BASE_DIR,
-            "LLM_API_URL": Config.LLM_API_URL,
-            "ENGINE_DIR": Config.ENGINE_DIR,
-            "TOKENIZER_DIR": Config.TOKENIZER_DIR,
-            "TLLM_IMAGE": Config.TLLM_IMAGE,
-            "CONTAINER_NAME": Config.CONTAINER_NAME,
-            "OPENAI_PORT": Config.OPENAI_PORT,
-            "FORCE_BUILD": Config.FORCE_BUILD,
+            "PROJECT_BASE_DIR": str(self.PROJECT_BASE_DIR),
+            "LLM_API_URL": self.LLM_API_URL,
+            "ENGINE_DIR": str(self.ENGINE_DIR),
+            "TOKENIZER_DIR": str(self.TOKENIZER_DIR),
+            "TLLM_IMAGE": self.TLLM_IMAGE,
+            "CONTAINER_NAME": self.CONTAINER_NAME,
+            "OPENAI_PORT": self.OPENAI_PORT,
+            "FORCE_BUILD": self.FORCE_BUILD,
             # new:
-            "DESIRED_EXPERIENCE_LEVELS": Config.DESIRED_EXPERIENCE_LEVELS,
-            "POSTED_WITHIN_DAYS": Config.POSTED_WITHIN_DAYS,
-            "DEFAULT_JOB_LOCATION": Config.DEFAULT_JOB_LOCATION,
+            "DESIRED_EXPERIENCE_LEVELS": self.DESIRED_EXPERIENCE_LEVELS,
+            "POSTED_WITHIN_DAYS": self.POSTED_WITHIN_DAYS,
+            "DEFAULT_JOB_LOCATION": self.DEFAULT_JOB_LOCATION,
         }
 # Initialize app directories immediately
-APP_CONFIG = Config()
+APP_CONFIG = Config.from_env()
 APP_CONFIG.ensure_dirs()
 
 if __name__ == "__main__":
@@ -3,42 +3,84 @@
 # PURPOSE: The main entry point for the AI Job Agent application.
 # ==============================================================================
 import os
+# Telemetry opt-out must be in place before anything imports crewai/opentelemetry.
+# start_services.sh exports these before launching Python; the defaults below
+# only cover a bare `python main.py`, and never override the caller's env.
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("OTEL_EXPORTER_OTLP_TIMEOUT", "1")
+os.environ.setdefault("CREWAI_TELEMETRY_OPT_OUT", "1")
+os.environ.setdefault("CREWAI_LOG_LEVEL", "DEBUG")   # more verbose tool logs
+
 import sys
-import time
-import json
-import requests
-os.environ["OTEL_SDK_DISABLED"] = "true"
-os.environ["OTEL_EXPORTER_OTLP_TIMEOUT"] = "1"
-os.environ["CREWAI_TELEMETRY_OPT_OUT"] = "1"
-os.environ["CREWAI_LOG_LEVEL"] = "DEBUG"   # more verbose tool logs
+import asyncio
 
 from config import APP_CONFIG
 from crewai import Crew, Process
 
 # Import the new agent and task classes
-from agents import JobAgents
+from agents import JobAgents, update_jobs_csv_tool
 from tasks import JobTasks
+from tools.skills import extract_skills
+from tools.llm_health import models_url, wait_online
+from tools.json_utils import dumps, loads
 
 # -----------------------------
-# Helper: ping OpenAI-compatible server
+# Helper: parse agent output
 # -----------------------------
-def check_llm_server() -> bool:
+def _parse_json(text: str):
     """
-    Send a minimal OpenAI-compatible /v1/chat/completions request.
+    Best-effort: pull the outermost JSON object out of an agent's final answer.
     """
-    url = APP_CONFIG.LLM_API_URL
-    payload = {
-        "model": "llama-2-7b-chat",
-        "messages": [{"role": "user", "content": "Ping"}],
-        "max_tokens": 1,
-    }
-    headers = {"Content-Type": "application/json"}
-
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end <= start:
+        return None
     try:
-        r = requests.post(url, json=payload, headers=headers, timeout=10)
-        return r.status_code == 200
-    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
-        return False
+        return loads(text[start:end + 1])
+    except ValueError:
+        return None
+
+# -----------------------------
+# Helper: analyze jobs concurrently
+# -----------------------------
+async def analyze_jobs_concurrently(agents, tasks, jobs: list, limit: int) -> dict:
+    """
+    Run one single-job analyst crew per job, at most `limit` in flight.
+    Returns {job_id: updates} for every job whose answer parsed as JSON.
+    """
+    sem = asyncio.Semaphore(limit)
+
+    async def analyze_one(job):
+        # the scraper only reads search cards, so raw_description is empty for now:
+        # this is effectively a title-only keyword match until descriptions are fetched
+        skills = extract_skills(f"{job.get('title', '')}\n{job.get('raw_description', '')}")
+        async with sem:
+            analyst = agents.job_analysis_agent()
+            crew = Crew(
+                agents=[analyst],
+                tasks=[tasks.analyze_job_task(analyst, job, skills)],
+                process=Process.sequential,
+                verbose=APP_CONFIG.CREWAI_VERBOSE
+            )
+            result = await crew.kickoff_async()
+        parsed = _parse_json(str(result))
+        if isinstance(parsed, dict) and isinstance(parsed.get("updates"), dict):
+            parsed = parsed["updates"]
+        # keyword matches back-fill skills when the model leaves them out
+        if isinstance(parsed, dict) and skills and not parsed.get("skills_extracted"):
+            parsed["skills_extracted"] = ", ".join(skills)
+        return job.get("job_id"), parsed
+
+    updates = {}
+    for res in await asyncio.gather(*(analyze_one(j) for j in jobs), return_exceptions=True):
+        if isinstance(res, Exception):
+            print(f"⚠️  Job analysis failed: {res}")
+            continue
+        job_id, parsed = res
+        if job_id and isinstance(parsed, dict):
+            updates[job_id] = parsed
+        else:
+            print(f"⚠️  Could not parse analyst output for job_id={job_id}")
+    return updates
 
 def main():
     print("=======================================")
@@ -52,16 +94,12 @@ def main():
         print(f"❌ Path verification failed: {e}")
         sys.exit(1)
 
-    print("Config summary:", json.dumps(APP_CONFIG.summary(), indent=2))
+    print("Config summary:", dumps(APP_CONFIG.summary(), indent=True))
 
-    retries = 5
-    while retries > 0 and not check_llm_server():
-        print(f"LLM server not found. Retrying in 10s... ({retries} left)")
-        time.sleep(10)
-        retries -= 1
+    ok, last_error = asyncio.run(wait_online(models_url(APP_CONFIG.LLM_API_URL)))
 
-    if not check_llm_server():
-        print("❌ Could not connect to the LLM server.")
+    if not ok:
+        print(f"❌ Could not connect to the LLM server: {last_error}")
         sys.exit(1)
     
     print("✅ LLM server is online.")
@@ -79,27 +117,44 @@ def main():
     tasks = JobTasks()
 
     researcher = agents.research_agent()
-    analyst = agents.analysis_agent()
 
     # Define the job search criteria
     search_keywords = ", ".join(APP_CONFIG.JOB_SEARCH_KEYWORDS)
     search_location = "Ontario, Canada"  
 
-    # Create the tasks
+    # Step 1: scrape (single sequential crew)
     find_jobs = tasks.find_jobs_task(researcher, search_keywords, search_location)
-    analyze_jobs = tasks.analyze_jobs_task(analyst, context=[find_jobs])
-
-    # Form the crew
     crew = Crew(
-        agents=[researcher, analyst],
-        tasks=[find_jobs, analyze_jobs],
+        agents=[researcher],
+        tasks=[find_jobs],
         process=Process.sequential,
-        verbose=1
+        verbose=APP_CONFIG.CREWAI_VERBOSE
     )
 
-    # Kick off the crew's work
-    print("\n🚀 Launching Crew to find and analyze jobs...")
-    result = crew.kickoff()
+    print("\n🚀 Launching Crew to find jobs...")
+    scraped = _parse_json(str(crew.kickoff()))
+
+    # Step 2: analyze each job concurrently, then persist with one batched write
+    if isinstance(scraped, dict) and isinstance(scraped.get("jobs"), list):
+        jobs = scraped["jobs"]
+        print(f"\n🚀 Analyzing {len(jobs)} jobs (up to {APP_CONFIG.ANALYST_CONCURRENCY} at a time)...")
+        updates = asyncio.run(
+            analyze_jobs_concurrently(agents, tasks, jobs, APP_CONFIG.ANALYST_CONCURRENCY)
+        ) if jobs else {}
+        if updates:
+            print(update_jobs_csv_tool._run(dumps({"batch": updates})))
+        result = dumps({"ok": True, "updates": updates}, indent=True)
+    else:
+        # Scraper answer wasn't parseable JSON: let one analyst work from its raw output
+        print("\n⚠️  Scraper output is not JSON; falling back to a single analyst task.")
+        analyst = agents.analysis_agent()
+        crew = Crew(
+            agents=[analyst],
+            tasks=[tasks.analyze_jobs_task(analyst, context=[find_jobs])],
+            process=Process.sequential,
+            verbose=APP_CONFIG.CREWAI_VERBOSE
+        )
+        result = crew.kickoff()
 
     print("\n--- Phase 2 Complete ---")
     print("\nFinal Report:")
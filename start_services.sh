@@ -4,7 +4,7 @@ set -euo pipefail
 # ==============================================================================
 # FILE: start_services.sh
 # PURPOSE: Manage LLM container and the Python agent (start/stop/status/restart)
-# USAGE: ./start_services.sh start-llm | stop-llm | status-llm | restart-llm | start-agent
+# USAGE: ./start_services.sh start-llm | stop-llm | status-llm | restart-llm | start-agent | warmup
 # ==============================================================================
 
 # --- Locate project & .env ---
@@ -104,6 +104,14 @@ start_llm() {
   set +x
 
   echo "✅ Launched. Logs: ./start_services.sh status-llm"
+
+  # Warm the engine in the background so the agent's first request is fast
+  local proj="${PROJECT_BASE_DIR:-${SCRIPT_DIR}}"
+  if [ -f "${proj}/venv/bin/activate" ]; then
+    mkdir -p "${proj}/logs"
+    nohup bash "${SCRIPT_DIR}/start_services.sh" warmup > "${proj}/logs/warmup.log" 2>&1 &
+    echo "🔥 Warm-up running in background. Log: ${proj}/logs/warmup.log"
+  fi
 }
 
 stop_llm() {
@@ -141,18 +149,35 @@ start_agent() {
   echo "🐍 Activating venv and starting agent..."
   # shellcheck disable=SC1091
   source "${proj}/venv/bin/activate"
+  # Telemetry off before the interpreter starts (skips the OTEL exporter probe)
+  export OTEL_SDK_DISABLED="${OTEL_SDK_DISABLED:-true}"
+  export OTEL_EXPORTER_OTLP_TIMEOUT="${OTEL_EXPORTER_OTLP_TIMEOUT:-1}"
+  export CREWAI_TELEMETRY_OPT_OUT="${CREWAI_TELEMETRY_OPT_OUT:-1}"
+  export CREWAI_LOG_LEVEL="${CREWAI_LOG_LEVEL:-DEBUG}"
   python "${proj}/main.py"
 }
 
+warmup() {
+  local proj="${PROJECT_BASE_DIR:-${SCRIPT_DIR}}"
+  if [ ! -f "${proj}/venv/bin/activate" ]; then
+    echo "❌ Virtualenv not found in ${proj}/venv. Run setup_project.sh first."
+    exit 1
+  fi
+  # shellcheck disable=SC1091
+  source "${proj}/venv/bin/activate"
+  python "${proj}/warmup.py"
+}
+
 case "${1:-}" in
   start-llm)    start_llm ;;
   stop-llm)     stop_llm ;;
   status-llm)   status_llm ;;
   restart-llm)  restart_llm ;;
   start-agent)  start_agent ;;
+  warmup)       warmup ;;
   help|--help|-h|"")
     cat <<EOF
-Usage: $0 {start-llm|stop-llm|status-llm|restart-llm|start-agent}
+Usage: $0 {start-llm|stop-llm|status-llm|restart-llm|start-agent|warmup}
 
 Commands:
   start-llm     Start TensorRT-LLM OpenAI-compatible server (detached)
@@ -160,6 +185,7 @@ Commands:
   status-llm    Follow the LLM container logs
   restart-llm   Stop then start the LLM container
   start-agent   Activate venv and run main.py (foreground)
+  warmup        Wait for the LLM, send one tiny completion, pre-import heavy modules
 EOF
     ;;
 esac
@@ -4,6 +4,7 @@
 # ==============================================================================
 from crewai import Task
 from agents import JobAgents
+from tools.json_utils import dumps
 
 class JobTasks:
     def find_jobs_task(self, agent, keywords: str, location: str):
@@ -26,7 +27,8 @@ class JobTasks:
                 "Input is the JSON from the previous task under key 'jobs'. "
                 "For each job, extract 'skills_extracted' (comma-separated), and optionally "
                 "'seniority_level', 'employment_type', 'salary_range'. "
-                "Use the 'Update Jobs CSV' tool to persist updates by 'job_id'. "
+                "Build a single JSON object {job_id: {...updates...}} covering all jobs, then call "
+                "the 'Update Jobs CSV' tool exactly once with {\"batch\": {job_id: {...updates...}}}. "
                 "Finally, return a JSON object mapping job_id -> updates applied. "
                 "Output ONLY JSON."
             ),
@@ -34,3 +36,27 @@ class JobTasks:
             context=context,
             expected_output="{\"ok\": true, \"updates\": {\"<job_id>\": {\"skills_extracted\": \"...\"}}}"
         )
+
+    def analyze_job_task(self, agent, job: dict, detected_skills=()):
+        """
+        One job per task so main.py can run them concurrently.
+        detected_skills: dictionary matches from tools.skills, given as a hint
+            (title-only while the scraper leaves raw_description empty).
+        """
+        fields = ("job_id", "title", "company", "location", "raw_description", "seniority_level")
+        job_json = dumps({k: job.get(k, "") for k in fields})
+        hint = f"Skills already detected by keyword match: {', '.join(detected_skills)}.\n" if detected_skills else ""
+        return Task(
+            description=(
+                f"Job posting (JSON): {job_json}\n"
+                f"{hint}"
+                "Extract 'skills_extracted' (comma-separated), and optionally "
+                "'seniority_level', 'employment_type', 'salary_range'. "
+                "Do not call any tools. Output ONLY a JSON object with those fields."
+            ),
+            agent=agent,
+            expected_output=(
+                "{\"skills_extracted\": \"...\", \"seniority_level\": \"...\", "
+                "\"employment_type\": \"...\", \"salary_range\": \"...\"}"
+            ),
+        )
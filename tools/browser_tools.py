@@ -1,11 +1,90 @@
 # ==============================================================================
 # FILE: tools/browser_tools.py
-# PURPOSE: Manages the Selenium WebDriver instance.
+# PURPOSE: Manages the Selenium WebDriver instances (pooled, kept warm).
 # ==============================================================================
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.firefox.service import Service as FirefoxService
-import shutil, os, tempfile
+from config import APP_CONFIG
+import atexit, queue, shutil, os, tempfile
+
+# Prefs written to user.js of every cloned profile (Firefox re-reads it on start)
+FIREFOX_PREFS = {
+    "browser.cache.disk.enable": False,
+    "browser.cache.memory.enable": False,
+    "browser.cache.offline.enable": False,
+    "network.http.use-cache": False,
+}
+
+# Page-weight cuts (APP_CONFIG.HEADLESS_FAST): job cards are plain HTML text,
+# so images, stylesheets, media and tracker beacons are pure overhead
+FAST_PREFS = {
+    "permissions.default.image": 2,             # 2 = block
+    "permissions.default.stylesheet": 2,
+    "media.autoplay.default": 5,                # 5 = block audio and video
+    "privacy.trackingprotection.enabled": True,
+}
+# Firefox defaults for the same prefs, written when HEADLESS_FAST is off: a seed
+# profile saved from a fast run still carries FAST_PREFS in its prefs.js
+FAST_PREFS_OFF = {
+    "permissions.default.image": 1,             # 1 = allow
+    "permissions.default.stylesheet": 1,
+    "media.autoplay.default": 0,                # 0 = allow
+    "privacy.trackingprotection.enabled": False,
+}
+
+# Runtime files that must not be copied into / out of a live profile
+_PROFILE_IGNORE = shutil.ignore_patterns("lock", ".parentlock", "parent.lock", "cache2", "startupCache")
+
+
+def _pref_line(name, value) -> str:
+    if isinstance(value, bool):
+        v = "true" if value else "false"
+    elif isinstance(value, int):
+        v = str(value)
+    else:
+        v = '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return f'user_pref("{name}", {v});\n'
+
+
+def _clone_profile() -> str:
+    """
+    Copy the seeded profile (if any) into a fresh temp dir next to it, so the
+    copy stays on the same filesystem and Firefox skips first-run profile init.
+    """
+    seed = APP_CONFIG.FIREFOX_PROFILE_DIR
+    seed.parent.mkdir(parents=True, exist_ok=True)
+    profile_dir = tempfile.mkdtemp(prefix="ff-profile-", dir=seed.parent)
+    if seed.is_dir():
+        shutil.copytree(seed, profile_dir, ignore=_PROFILE_IGNORE, dirs_exist_ok=True)
+    with open(os.path.join(profile_dir, "user.js"), "w", encoding="utf-8") as f:
+        prefs = {**FIREFOX_PREFS, **(FAST_PREFS if APP_CONFIG.HEADLESS_FAST else FAST_PREFS_OFF)}
+        f.writelines(_pref_line(k, v) for k, v in prefs.items())
+    return profile_dir
+
+
+class _ProfiledFirefox(webdriver.Firefox):
+    """
+    Firefox bound to a cloned profile dir. quit() seeds the persistent profile
+    from the first profile Firefox initialized, then deletes the clone.
+    """
+
+    def __init__(self, profile_dir: str, **kwargs):
+        self._profile_dir = profile_dir
+        super().__init__(**kwargs)
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            seed = APP_CONFIG.FIREFOX_PROFILE_DIR
+            if not seed.exists():
+                try:
+                    shutil.copytree(self._profile_dir, seed, ignore=_PROFILE_IGNORE)
+                except (FileExistsError, shutil.Error, OSError) as e:
+                    print(f"[Browser] Could not seed profile {seed}: {e}")
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
 
 
 def get_webdriver():
@@ -28,11 +107,70 @@ def get_webdriver():
     opts.add_argument("-headless")
     opts.add_argument("--no-remote")
 
-    # Use a temp profile to bypass Snap's user data dir restrictions
-    profile_dir = tempfile.mkdtemp(prefix="ff-profile-")
-    opts.set_preference("browser.cache.disk.enable", False)
-    opts.set_preference("browser.cache.memory.enable", False)
-    opts.set_preference("browser.cache.offline.enable", False)
-    opts.set_preference("network.http.use-cache", False)
+    # Own profile dir (bypasses Snap's user data dir restrictions); cloned from
+    # a persistent seed so profile databases are only created once.
+    profile_dir = _clone_profile()
+    opts.add_argument("-profile")
+    opts.add_argument(profile_dir)
+
+    try:
+        return _ProfiledFirefox(profile_dir, service=FirefoxService(geckodriver), options=opts)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+
+
+# ----------------------------
+# Warm driver pool: Firefox + geckodriver cold start costs seconds per scrape
+# ----------------------------
+# (WEBDRIVER_POOL_SIZE=0 disables pooling; maxsize=0 would mean unbounded)
+_pool = queue.LifoQueue(maxsize=max(APP_CONFIG.WEBDRIVER_POOL_SIZE, 1))
+
+
+def _quit(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def acquire_webdriver():
+    """
+    Check out a warm driver, or start a new one (get_webdriver) if the pool is
+    empty. Returns None when Firefox/geckodriver are unavailable.
+    """
+    while True:
+        try:
+            driver = _pool.get_nowait()
+        except queue.Empty:
+            return get_webdriver()
+        try:
+            driver.current_url   # cheap liveness check; browser may have died while idle
+            return driver
+        except WebDriverException:
+            _quit(driver)
+
+
+def release_webdriver(driver) -> None:
+    """Reset the session and return it to the pool; quit it if the pool is full or reset fails."""
+    if driver is None:
+        return
+    if APP_CONFIG.WEBDRIVER_POOL_SIZE <= 0:
+        _quit(driver)
+        return
+    try:
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        _pool.put_nowait(driver)
+    except (WebDriverException, queue.Full):
+        _quit(driver)
+
 
-    return webdriver.Firefox(service=FirefoxService(geckodriver), options=opts)
\ No newline at end of file
+@atexit.register
+def close_webdriver_pool() -> None:
+    while True:
+        try:
+            driver = _pool.get_nowait()
+        except queue.Empty:
+            return
+        _quit(driver)
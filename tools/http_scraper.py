@@ -0,0 +1,115 @@
+"""
+tools/http_scraper.py
+Browser-free fetch + parse of LinkedIn's public job listings (guest jobs API
+fragment or the server-rendered search page; same card markup).
+ScrapeLinkedInTool tries this first and only starts Firefox when it gets blocked.
+"""
+import io
+
+from lxml import etree
+
+try:
+    import httpx
+except ImportError:  # optional: the tool falls back to Selenium without it
+    httpx = None
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux aarch64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+# LinkedIn answers bots with auth walls / 999 instead of the results page
+_BLOCKED_STATUS = {401, 403, 429, 999}
+_BLOCKED_URL_MARKERS = ("authwall", "checkpoint", "/login")
+
+_client = None
+
+
+def _get_client():
+    """Module-level client so repeated scrapes reuse pooled keep-alive connections."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(
+            headers=_HEADERS,
+            timeout=10,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+        )
+    return _client
+
+
+def fetch_search_page(url: str) -> str | None:
+    """
+    GET a LinkedIn job search / guest API URL without a browser.
+
+    Returns:
+        Page HTML, or None when httpx is missing, the request failed, or LinkedIn
+        served a block/challenge (callers should fall back to Selenium).
+    """
+    if httpx is None:
+        return None
+    try:
+        r = _get_client().get(url)
+    except httpx.HTTPError as e:
+        print(f"[LinkedIn/http] request failed: {e}")
+        return None
+    if r.status_code != 200:
+        reason = "blocked" if r.status_code in _BLOCKED_STATUS else "unexpected status"
+        print(f"[LinkedIn/http] {reason} (HTTP {r.status_code})")
+        return None
+    if any(m in str(r.url) for m in _BLOCKED_URL_MARKERS):
+        print(f"[LinkedIn/http] redirected to challenge: {r.url}")
+        return None
+    return r.text
+
+
+# ----------------------------
+# Card parsing (streamed; XPath compiled once, evaluated in C by lxml)
+# ----------------------------
+def _has_class(name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+_TITLE = etree.XPath(f'.//h3[{_has_class("base-search-card__title")}]')
+_COMPANY = etree.XPath(f'.//h4[{_has_class("base-search-card__subtitle")}]')
+_LOCATION = etree.XPath(f'.//span[{_has_class("job-search-card__location")}]')
+_LINK = etree.XPath(f'.//a[{_has_class("base-card__full-link")}]')
+
+
+def _text(elem) -> str:
+    # itertext == html text_content() (tree from iterparse is plain etree)
+    return "".join(elem.itertext()).strip()
+
+
+def parse_cards(page_html: str) -> list[dict]:
+    """
+    Extract {title, company, location, link} from every job card on the page.
+    Cards missing any of the four elements are skipped.
+    The page is stream-parsed: each card is read when its </div> arrives and
+    then dropped (with everything before it), so the full DOM is never held.
+    """
+    if not page_html or not page_html.strip():
+        return []
+    cards = []
+    events = etree.iterparse(
+        io.BytesIO(page_html.encode("utf-8")), events=("end",), tag="div",
+        html=True, encoding="utf-8", recover=True,
+    )
+    for _, c in events:
+        if "base-card" not in (c.get("class") or "").split():
+            continue   # nested/unrelated div: keep it, it may be inside a card
+        title, company, location, link = _TITLE(c), _COMPANY(c), _LOCATION(c), _LINK(c)
+        if title and company and location and link:
+            cards.append({
+                "title": _text(title[0]),
+                "company": _text(company[0]),
+                "location": _text(location[0]),
+                "link": (link[0].get("href") or "").strip(),
+            })
+        c.clear()
+        # everything before this card (at every level) is already processed
+        node = c
+        while (parent := node.getparent()) is not None:
+            while node.getprevious() is not None:
+                del parent[0]
+            node = parent
+    return cards
@@ -0,0 +1,312 @@
+"""
+tools/jobs_csv.py
+In-place row updates for the daily jobs CSV.
+
+Rows are written with ROW_SLACK spaces of padding before the line terminator,
+so a status update can overwrite just that record (same byte length) instead
+of re-parsing and rewriting the whole file. A sidecar index
+(.index/jobs_YYYY-MM-DD.idx, JSON) maps job_id -> [offset, length]; it is built on
+first touch and extended incrementally after appends. Its keys double as the
+exact id set for the scraper's dedup.
+
+The padding lands in the last column, so readers rstrip(" ") that value.
+JobIdBloom backs the scraper's .index/jobs_YYYY-MM-DD.bloom "already seen?" sidecar.
+"""
+import csv
+import hashlib
+import io
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: no cross-process locking
+    fcntl = None
+
+from tools.json_utils import dumps, loads
+
+# Spare bytes per record for fields filled in later (skills, ATS score, ...)
+ROW_SLACK = 512
+# csv.writer terminator that pads every record: slack spaces + CRLF (csv module default)
+PADDED_TERMINATOR = " " * ROW_SLACK + "\r\n"
+
+
+def padded_writer(f):
+    """csv.writer over text file f (newline="") whose records all carry ROW_SLACK padding."""
+    return csv.writer(f, lineterminator=PADDED_TERMINATOR)
+
+
+def format_record(values, slack: int = ROW_SLACK) -> bytes:
+    """One CSV record as UTF-8 bytes: fields, `slack` spaces, CRLF."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator=" " * slack + "\r\n").writerow(values)
+    return buf.getvalue().encode("utf-8")
+
+
+def csv_value(v) -> str:
+    """The string csv.writer stores for v (None -> ""), i.e. what a re-read returns."""
+    return "" if v is None else str(v)
+
+
+def parse_record(rec: bytes, width: int = 0) -> list[str]:
+    """Inverse of format_record (padding stripped); short rows are filled to `width`."""
+    values = next(csv.reader(io.StringIO(rec.decode("utf-8"), newline="")), [])
+    if values:
+        values[-1] = values[-1].rstrip(" ")
+    if len(values) < width:
+        values.extend([""] * (width - len(values)))
+    return values
+
+
+# Sidecars live one level down, so rewriting them leaves the data dir's mtime
+# alone (workflow_tools reuses its newest-CSV lookup while that is unchanged)
+SIDECAR_DIR = ".index"
+
+
+def _sidecar_path(csv_path: str, ext: str) -> str:
+    head, name = os.path.split(csv_path)
+    return os.path.join(head, SIDECAR_DIR, os.path.splitext(name)[0] + ext)
+
+
+def index_path(csv_path: str) -> str:
+    return _sidecar_path(csv_path, ".idx")
+
+
+def bloom_path(csv_path: str) -> str:
+    return _sidecar_path(csv_path, ".bloom")
+
+
+def _replace_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # unique temp name: several readers may refresh the same sidecar at once
+    with tempfile.NamedTemporaryFile("wb", dir=os.path.dirname(path) or ".", delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)
+
+
+def open_locked(path: str, mode: str, op: int | None = None, **kwargs):
+    """
+    open(path, mode, **kwargs) holding flock op (default LOCK_EX).
+    The full-rewrite fallback os.replace()s the CSV, so a lock won on the
+    replaced inode is dropped and taken again on the current file.
+    """
+    while True:
+        f = open(path, mode, **kwargs)
+        if fcntl is None:
+            return f
+        fcntl.flock(f, fcntl.LOCK_EX if op is None else op)
+        try:
+            if os.stat(path).st_ino == os.fstat(f.fileno()).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        f.close()
+
+
+# ----------------------------
+# Bloom filter of job ids (.index/jobs_YYYY-MM-DD.bloom)
+# ----------------------------
+class JobIdBloom:
+    """
+    Fixed-size Bloom filter over job ids. A miss is definite; a hit must be
+    confirmed against the exact id set. `covered` is the CSV size (bytes)
+    whose ids have all been added. File layout: 8-byte LE covered + bits.
+    """
+    BITS = 1 << 18      # 32 KiB; ~3e-5 false positives at 10k ids
+    HASHES = 7
+    __slots__ = ("bits", "covered")
+
+    def __init__(self, bits: bytearray | None = None, covered: int = 0):
+        self.bits = bits if bits is not None else bytearray(self.BITS // 8)
+        self.covered = covered
+
+    @classmethod
+    def _positions(cls, job_id: str):
+        # ids are already hash digests (hex); double hashing over their 64 bits
+        try:
+            h = int(job_id[:16], 16)
+        except ValueError:
+            h = int.from_bytes(hashlib.blake2b(job_id.encode("utf-8"), digest_size=8).digest(), "little")
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % cls.BITS for i in range(cls.HASHES)]
+
+    def add(self, job_id: str) -> None:
+        for p in self._positions(job_id):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, job_id: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] >> (p & 7) & 1 for p in self._positions(job_id))
+
+    @classmethod
+    def load(cls, path: str) -> "JobIdBloom | None":
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) != 8 + cls.BITS // 8:
+            return None
+        return cls(bytearray(data[8:]), int.from_bytes(data[:8], "little"))
+
+    def save(self, path: str) -> None:
+        try:
+            _replace_atomic(path, self.covered.to_bytes(8, "little") + bytes(self.bits))
+        except OSError as e:
+            print(f"[jobs_csv] Could not write bloom filter {path}: {e}")
+
+
+# ----------------------------
+# Index (job_id -> [offset, length])
+# ----------------------------
+def _scan(data: bytes, base: int, index: dict) -> None:
+    """
+    Add every complete record in data (file bytes starting at offset base).
+    A newline only ends a record when the quotes seen so far are balanced, so
+    quoted multi-line descriptions are handled without a full CSV parse.
+    """
+    rows = index["rows"]
+    pos = rec_start = 0
+    quotes = 0
+    while True:
+        nl = data.find(b"\n", pos)
+        if nl == -1:
+            break
+        quotes += data.count(b'"', pos, nl)
+        pos = nl + 1
+        if quotes % 2:
+            continue
+        rec = data[rec_start:pos]
+        if base + rec_start == 0:
+            index["header"] = parse_record(rec)
+        else:
+            comma = rec.find(b",")
+            job_id = (rec[:comma] if comma != -1 else rec.rstrip()).strip(b'"').decode("utf-8")
+            if job_id:
+                rows[job_id] = [base + rec_start, len(rec)]
+        rec_start, quotes = pos, 0
+    index["end"] = base + rec_start
+
+
+def _stat_key(st) -> list:
+    # no mtime: in-place updates keep inode, size and offsets, so they leave the
+    # index valid (a record changed behind our back is caught by _fetch's id check)
+    return [st.st_ino, st.st_size]
+
+
+def _save_index(csv_path: str, index: dict) -> None:
+    try:
+        _replace_atomic(index_path(csv_path), dumps(index).encode("utf-8"))
+    except OSError as e:
+        print(f"[jobs_csv] Could not write index for {csv_path}: {e}")
+
+
+def load_index(csv_path: str, f, rebuild: bool = False) -> dict:
+    """
+    Return a fresh index for the open (binary) CSV file f.
+    Same inode and size -> used as is; grown file -> only the appended tail is scanned.
+    """
+    st = os.fstat(f.fileno())
+    index = None
+    if not rebuild:
+        try:
+            with open(index_path(csv_path), "rb") as fi:
+                index = loads(fi.read())
+        except (OSError, ValueError):
+            index = None
+    if isinstance(index, dict) and index.get("stat") == _stat_key(st):
+        return index
+    if (not isinstance(index, dict) or not index.get("stat") or index["stat"][0] != st.st_ino
+            or index.get("end", 0) > st.st_size):
+        index = {"header": [], "rows": {}, "end": 0}
+    f.seek(index["end"])
+    _scan(f.read(), index["end"], index)
+    index["stat"] = _stat_key(st)
+    _save_index(csv_path, index)
+    return index
+
+
+def indexed_ids(csv_path: str) -> set:
+    """
+    Exact set of job ids in csv_path, read from the .idx sidecar (the job_id
+    "column projection" of the CSV); only bytes appended since it was saved are scanned.
+    """
+    with open(csv_path, "rb") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH)
+        try:
+            return set(load_index(csv_path, f)["rows"])
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# ----------------------------
+# In-place update
+# ----------------------------
+def _fetch(f, index: dict, job_id: str):
+    loc = index["rows"].get(job_id)
+    if loc is None:
+        return None
+    f.seek(loc[0])
+    rec = f.read(loc[1])
+    if len(rec) != loc[1]:
+        return None
+    values = parse_record(rec, len(index["header"]))
+    if values[0] != job_id:
+        return None
+    return loc[0], rec, values
+
+
+def update_in_place(csv_path: str, updates: dict) -> tuple[dict, list] | None:
+    """
+    Apply {job_id: {field: value}} by overwriting each record within its slack.
+
+    Returns:
+        ({job_id: full row dict}, [job_ids not found]), or None when any record
+        cannot be rewritten in place (unknown column, record too long, unindexed
+        tail); nothing is written in that case and the caller should fall back
+        to a full rewrite.
+    """
+    with open_locked(csv_path, "r+b") as f:
+        try:
+            index = load_index(csv_path, f)
+            rebuilt = False
+            header = index["header"]
+            col = {name: i for i, name in enumerate(header)}
+            found, not_found, writes = {}, [], []
+            for job_id, fields in updates.items():
+                hit = _fetch(f, index, job_id)
+                if hit is None and job_id in index["rows"] and not rebuilt:
+                    # offsets no longer match the file (edited elsewhere) -> rescan once
+                    index, rebuilt = load_index(csv_path, f, rebuild=True), True
+                    hit = _fetch(f, index, job_id)
+                if hit is None:
+                    if index["end"] < os.fstat(f.fileno()).st_size:
+                        return None   # unterminated tail we did not index
+                    not_found.append(job_id)
+                    continue
+                offset, rec, values = hit
+                if fields:
+                    if any(k not in col for k in fields):
+                        return None
+                    for k, v in fields.items():
+                        values[col[k]] = csv_value(v)
+                    term = rec[len(rec.rstrip(b"\r\n")):]
+                    body = format_record(values, slack=0)[:-2]
+                    room = len(rec) - len(term) - len(body)
+                    if room < 0:
+                        return None
+                    writes.append((offset, body + b" " * room + term))
+                found[job_id] = dict(zip(header, values))
+
+            if writes:
+                for offset, data in writes:
+                    f.seek(offset)
+                    f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            return found, not_found
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
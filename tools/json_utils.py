@@ -0,0 +1,43 @@
+"""
+tools/json_utils.py
+JSON helpers backed by orjson (C, SIMD string escaping) with a stdlib fallback.
+Both paths emit UTF-8 text without ASCII escaping, like json.dumps(ensure_ascii=False).
+"""
+import dataclasses
+import json
+import os
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _default(o):
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, os.PathLike):
+        return os.fspath(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps(obj, indent: bool = False, sort_keys: bool = False, default=_default) -> str:
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None,
+                      sort_keys=sort_keys, default=default)
+
+
+def dumpb(obj, sort_keys: bool = False, default=_default) -> bytes:
+    """UTF-8 bytes, for hashing or request bodies (skips the str round-trip under orjson)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return dumps(obj, sort_keys=sort_keys, default=default).encode("utf-8")
+
+
+def loads(s):
+    """Parse str/bytes. Errors are ValueError subclasses on both paths."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
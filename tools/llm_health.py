@@ -0,0 +1,119 @@
+"""
+tools/llm_health.py
+Liveness checks for the local OpenAI-compatible LLM server.
+One implementation for every entry point (main.py, warmup.py, ...).
+Probes use http.client directly: localhost needs no DNS/TLS, and a bare GET
+skips the requests/httpx machinery. Real LLM payloads still go through those.
+"""
+import asyncio
+import errno
+import http.client
+import select
+import socket
+import time
+from urllib.parse import urlsplit
+
+# Delays between probes (exponential backoff) instead of fixed 10s sleeps.
+DEFAULT_BACKOFF = (0.5, 1, 2, 4)
+# How often to retry a refused TCP connect while waiting for the port
+PORT_POLL_INTERVAL = 0.2
+
+
+def models_url(api_url: str) -> str:
+    """
+    Derive the cheap metadata endpoint (/v1/models) from a chat-completions URL.
+    """
+    base = api_url.rstrip("/")
+    if base.endswith("/chat/completions"):
+        base = base[: -len("/chat/completions")]
+    return f"{base}/models"
+
+
+def wait_port(host: str, port: int, deadline: float, poll: float = PORT_POLL_INTERVAL) -> bool:
+    """
+    Return True as soon as host:port accepts a TCP connection, False once
+    time.monotonic() passes deadline. Non-blocking connect + select, so an
+    opening port is noticed within one poll interval instead of one backoff step.
+    """
+    # every address on each poll (like socket.create_connection): localhost may
+    # resolve to ::1 first while the server only listens on 127.0.0.1
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    while True:
+        waited = False
+        for family, socktype, proto, _, addr in infos:
+            try:
+                with socket.socket(family, socktype, proto) as sock:
+                    sock.setblocking(False)
+                    rc = sock.connect_ex(addr)
+                    if rc in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        wait = max(0.0, min(poll, deadline - time.monotonic()))
+                        _, writable, _ = select.select([], [sock], [], wait)
+                        rc = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) if writable else errno.ETIMEDOUT
+            except OSError:   # e.g. EAFNOSUPPORT for ::1 with IPv6 disabled
+                continue
+            if rc in (0, errno.EISCONN):
+                return True
+            waited = waited or rc == errno.ETIMEDOUT
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if not waited:   # all refused immediately -> don't spin
+            time.sleep(min(poll, remaining))
+
+
+def _probe_sync(conn: http.client.HTTPConnection, path: str) -> tuple[bool, str | None]:
+    try:
+        conn.request("GET", path)
+        r = conn.getresponse()
+        r.read()   # drain so the keep-alive connection can be reused
+    except (OSError, http.client.HTTPException) as e:
+        conn.close()   # next request() reconnects
+        return False, str(e) or type(e).__name__
+    if r.status != 200:
+        return False, f"HTTP {r.status}"
+    return True, None
+
+
+async def probe_once(conn: http.client.HTTPConnection, path: str) -> tuple[bool, str | None]:
+    """
+    Single GET probe on an open-or-reconnectable connection.
+    Returns (ok, error) where error is None on HTTP 200.
+    """
+    return await asyncio.to_thread(_probe_sync, conn, path)
+
+
+async def wait_online(url: str, backoff=DEFAULT_BACKOFF, timeout: float = 2.0,
+                      port_timeout: float | None = None) -> tuple[bool, str | None]:
+    """
+    Wait (up to port_timeout, default sum(backoff)) for the server's port to
+    accept connections, then probe url until it answers 200, sleeping
+    backoff[i] between attempts. All HTTP attempts share one HTTPConnection
+    (keep-alive). Returns the last (ok, error).
+    """
+    u = urlsplit(url)
+    https = u.scheme == "https"
+    host, port = u.hostname or "localhost", u.port or (443 if https else 80)
+    if port_timeout is None:
+        port_timeout = sum(backoff)
+    deadline = time.monotonic() + port_timeout
+    try:
+        port_open = await asyncio.to_thread(wait_port, host, port, deadline)
+    except OSError as e:   # e.g. unresolvable host
+        return False, str(e)
+    if not port_open:
+        return False, f"{host}:{port} not accepting connections after {port_timeout:g}s"
+
+    conn_cls = http.client.HTTPSConnection if https else http.client.HTTPConnection
+    conn = conn_cls(host, port, timeout=timeout)
+    path = u.path or "/"
+    try:
+        ok, err = await probe_once(conn, path)
+        for i, delay in enumerate(backoff):
+            if ok:
+                break
+            print(f"LLM server not found ({err}). Retrying in {delay}s... ({len(backoff) - i} left)")
+            await asyncio.sleep(delay)
+            ok, err = await probe_once(conn, path)
+    finally:
+        conn.close()
+    return ok, err
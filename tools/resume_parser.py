@@ -2,25 +2,109 @@
 tools/resume_parser.py
 Simple .docx resume reader used by main.py
 """
-import docx
 import os
+import zipfile
+import xml.etree.ElementTree as ET
 from config import APP_CONFIG
+from tools.json_utils import dumps, loads
+
+# WordprocessingML namespace used in word/document.xml
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Parsed text of the last resume read, keyed by (path, mtime_ns, size, format)
+RESUME_CACHE_PATH = APP_CONFIG.LOGS_DIR / "resume_cache.json"
+# Bump when the extracted text changes shape so stale cache entries are ignored
+_CACHE_FORMAT = 2
+
+
+def _docx_text_fast(file_path: str) -> str:
+    """
+    Stream <w:t> text out of word/document.xml without building a DOM.
+    One output line per non-empty <w:p>, matching python-docx paragraph text.
+    """
+    lines, parts = [], []
+    in_ppr = 0   # inside <w:pPr>: its <w:tabs><w:tab/> are tab-stop definitions, not text
+    with zipfile.ZipFile(file_path) as zf, zf.open("word/document.xml") as xml:
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if tag == _W + "pPr":
+                in_ppr += 1 if event == "start" else -1
+                continue
+            if event == "start" or in_ppr:
+                continue
+            if tag == _W + "t":
+                if elem.text:
+                    parts.append(elem.text)
+            elif tag == _W + "tab":
+                parts.append("\t")
+            elif tag in (_W + "br", _W + "cr"):
+                parts.append("\n")
+            elif tag == _W + "p":
+                if parts:
+                    lines.append("".join(parts))
+                    parts = []
+                # paragraph fully consumed -> drop its subtree to keep memory flat
+                elem.clear()
+    return '\n'.join(lines)
+
+
+def _parse_docx(file_path: str) -> str:
+    try:
+        return _docx_text_fast(file_path)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        pass
+    # fallback: full python-docx parse (slower, but more forgiving)
+    import docx
+    doc = docx.Document(file_path)
+    return '\n'.join(filter(None, (p.text for p in doc.paragraphs)))
+
+
+def _cache_key(file_path: str) -> list:
+    st = os.stat(file_path)
+    return [os.path.abspath(file_path), st.st_mtime_ns, st.st_size, _CACHE_FORMAT]
+
+
+def _read_cache(key: list) -> str | None:
+    try:
+        with open(RESUME_CACHE_PATH, "rb") as f:
+            cached = loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if isinstance(cached, dict) and cached.get("key") == key:
+        return cached.get("text")
+    return None
+
+
+def _write_cache(key: list, text: str) -> None:
+    tmp = f"{RESUME_CACHE_PATH}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(dumps({"key": key, "text": text}))
+        os.replace(tmp, RESUME_CACHE_PATH)
+    except OSError as e:
+        print(f"[Resume] Could not write cache {RESUME_CACHE_PATH}: {e}")
+
 
 def get_resume_text(file_path: str) -> str:
     """
-    Extracts all text from a .docx file.
+    Extracts all text from a .docx file. Re-runs with an unchanged file
+    (same mtime and size) are served from RESUME_CACHE_PATH without parsing.
 
     Returns:
         String with document text or an error message starting with 'Error:'.
     """
     if not os.path.exists(file_path):
         return f"Error: Resume file not found at {file_path}"
+    key = _cache_key(file_path)
+    text = _read_cache(key)
+    if text is not None:
+        return text
     try:
-        doc = docx.Document(file_path)
-        paragraphs = [p.text for p in doc.paragraphs if p.text]
-        return '\n'.join(paragraphs)
+        text = _parse_docx(file_path)
     except Exception as e:
         return f"Error parsing resume file: {e}"
+    _write_cache(key, text)
+    return text
 
 if __name__ == '__main__':
     print("--- Testing Resume Parser ---")
@@ -9,20 +9,62 @@ from typing import ClassVar, List, Optional, Type
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 
-from tools.browser_tools import get_webdriver
+from tools.browser_tools import acquire_webdriver, release_webdriver
+from tools.http_scraper import fetch_search_page, parse_cards
+from tools.jobs_csv import JobIdBloom, bloom_path, format_record, indexed_ids, open_locked
+from tools.json_utils import dumps
 from config import APP_CONFIG
 
 import os
-import csv
-import json
-import time
+try:
+    import fcntl
+except ImportError:  # non-POSIX: appends are not cross-process locked
+    fcntl = None
 import hashlib
+import mmap
+import operator
 import re
+from dataclasses import dataclass, fields
 from datetime import date
-from urllib.parse import urlparse, quote_plus
+from urllib.parse import quote_plus
+
+
+# ----------------------------
+# Scraped row (one per job; also the CSV schema)
+# ----------------------------
+@dataclass(slots=True, frozen=True)
+class JobRow:
+    job_id: str
+    date_scraped: str
+    title: str
+    company: str
+    location: str
+    link: str
+    source: str = "LinkedIn"
+    raw_description: str = ""
+    keywords_matched: str = ""
+    # workflow tracking
+    resume_customized: str = "no"
+    ats_score_checked: str = "no"
+    ats_score: str = ""
+    approved_for_application: str = "no"
+    application_submitted: str = "no"
+    resume_id_used: str = ""
+    date_applied: str = ""
+    # optional enrichment
+    seniority_level: str = ""
+    employment_type: str = ""
+    salary_range: str = ""
+    skills_extracted: str = ""
+
+
+CSV_FIELDS = [f.name for f in fields(JobRow)]
+# JobRow -> CSV record tuple (C-level getattr per field, no per-row dict)
+_row_values = operator.attrgetter(*CSV_FIELDS)
+_CSV_HEADER = format_record(CSV_FIELDS, slack=0)
+# job_id (16 hex chars, see _job_id) at the start of a record: hex never needs CSV quoting
+_JOB_ID_RE = re.compile(rb"(?m)^([0-9a-f]{16}),")
 
 
 # ----------------------------
@@ -53,31 +95,27 @@ class ScrapeLinkedInTool(BaseTool):
     # structured tool args
     args_schema: Type[BaseModel] = LinkedInSearchArgs
 
-    # CSV schema (Pydantic v2-safe as ClassVar)
-    CSV_FIELDS: ClassVar[List[str]] = [
-        "job_id",
-        "date_scraped",
-        "title",
-        "company",
-        "location",
-        "link",
-        "source",
-        "raw_description",
-        "keywords_matched",
-        # workflow tracking
-        "resume_customized",
-        "ats_score_checked",
-        "ats_score",
-        "approved_for_application",
-        "application_submitted",
-        "resume_id_used",
-        "date_applied",
-        # optional enrichment
-        "seniority_level",
-        "employment_type",
-        "salary_range",
-        "skills_extracted",
-    ]
+    # CSV schema (Pydantic v2-safe as ClassVar), in JobRow field order
+    CSV_FIELDS: ClassVar[List[str]] = CSV_FIELDS
+
+    # title heuristics (belt & suspenders), one pass per title
+    TITLE_RE: ClassVar[re.Pattern] = re.compile(
+        r"\b(?:"
+        r"(?P<excl>senior|sr\.?|lead|principal|staff|director|vp|head|chief|architect)"
+        r"|(?P<intern>intern|internship|co[-\s]?op|coop|new\s*grad)"
+        r"|(?P<entry>entry[-\s]?level|junior|graduate)"
+        r"|(?P<assoc>associate)"
+        r")\b",
+        re.I,
+    )
+    # first group present wins; no match -> trust f_E filter and default to Associate
+    SENIORITY_BY_GROUP: ClassVar[tuple] = (("intern", "Internship"), ("entry", "Entry"), ("assoc", "Associate"))
+
+    # public (logged-out) endpoint behind the search page's "see more jobs"
+    GUEST_API_URL: ClassVar[str] = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+
+    # path -> (mtime_ns, size, job ids), shared by all instances in this process
+    _id_cache: ClassVar[dict] = {}
 
     # ----------------------------
     # Helpers
@@ -89,50 +127,102 @@ class ScrapeLinkedInTool(BaseTool):
 
     def _ensure_csv(self, path: str) -> None:
         if not os.path.exists(path):
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
-                writer.writeheader()
-
-    def _load_existing_ids(self, path: str) -> set:
-        ids = set()
-        if os.path.exists(path):
-            with open(path, "r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    jid = row.get("job_id")
-                    if jid:
-                        ids.add(jid)
-        return ids
+            with open(path, "wb") as f:
+                f.write(_CSV_HEADER)
 
-    def _normalize_link(self, link: str) -> str:
+    def _append_rows(self, path: str, rows: List[JobRow]) -> tuple[int, os.stat_result]:
+        """
+        Append rows in one buffered write. Never rewrites existing rows; the
+        header is written only if the file is empty. flock serializes
+        concurrent appenders (e.g. two scrapes in separate processes).
+        Records are padded (tools/jobs_csv.py) so later updates fit in place.
+        Returns (size before the write, stat after it), both taken under the lock.
+        """
+        with open_locked(path, "ab", buffering=1 << 20) as f:
+            try:
+                size_before = os.fstat(f.fileno()).st_size
+                if size_before == 0:
+                    f.write(_CSV_HEADER)
+                f.write(b"".join(format_record(_row_values(r)) for r in rows))
+                f.flush()
+                return size_before, os.fstat(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_existing_ids(self, path: str) -> frozenset:
+        # memoized per path while (mtime_ns, size) is unchanged
         try:
-            u = urlparse(link)
-            return f"{u.scheme}://{u.netloc}{u.path}".rstrip("/")
-        except Exception:
-            return link.strip().rstrip("/")
-
-    def _job_id(self, title: str, company: str, location: str, link: str) -> str:
-        base = f"{title.lower()}|{company.lower()}|{location.lower()}|{self._normalize_link(link).lower()}"
-        return hashlib.sha1(base.encode("utf-8")).hexdigest()
+            st = os.stat(path)
+        except FileNotFoundError:
+            return frozenset()
+        cached = self._id_cache.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        ids = frozenset()
+        if st.st_size:
+            try:
+                # keys of the .idx sidecar shared with UpdateJobsCsvTool (tail-scanned only)
+                ids = frozenset(indexed_ids(path))
+            except (OSError, ValueError) as e:
+                print(f"[LinkedIn] id index unavailable ({e}); scanning {path}")
+                # only column 0 is needed: byte-scan the mapped file instead of parsing every field
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    ids = frozenset(m.group(1).decode("ascii") for m in _JOB_ID_RE.finditer(mm))
+        self._id_cache[path] = (st.st_mtime_ns, st.st_size, ids)
+        return ids
 
-    # ----------------------------
-    # Main run (Firefox via get_webdriver)
-    # ----------------------------
-    def _run(self, keywords: str, location: Optional[str] = None) -> str:
+    def _load_id_bloom(self, path: str) -> JobIdBloom:
         """
-        JSON return format:
-        {
-          "ok": true,
-          "csv_path": "<.../data/jobs_YYYY-MM-DD.csv>",
-          "appended": <int>,
-          "jobs": [ {<full CSV-schema row>}, ... ]   # only new rows
-        }
+        Bloom filter of the ids in path (sidecar .bloom), brought up to date by
+        scanning only the bytes appended since it was last saved.
         """
-        driver = get_webdriver()
-        if not driver:
-            return json.dumps({"ok": False, "error": "WebDriver not available."})
+        bpath = bloom_path(path)
+        bloom = JobIdBloom.load(bpath)
+        with open(path, "rb") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_SH)   # no half-written appended record
+            try:
+                size = os.fstat(f.fileno()).st_size
+                if bloom is not None and 0 < bloom.covered <= size:
+                    f.seek(bloom.covered - 1)
+                    if f.read(1) != b"\n":   # not a record boundary (file rewritten) -> rebuild
+                        bloom = None
+                if bloom is None or bloom.covered > size:
+                    bloom = JobIdBloom()
+                if bloom.covered == size:
+                    return bloom
+                f.seek(bloom.covered)
+                tail = f.read(size - bloom.covered)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        for m in _JOB_ID_RE.finditer(tail):
+            bloom.add(m.group(1).decode("ascii"))
+        bloom.covered = size
+        bloom.save(bpath)
+        return bloom
+
+    def _normalize_link(self, link: str) -> str:
+        # drop query (tracking params) and fragment with plain str ops; LinkedIn
+        # job links are always absolute, so urlparse adds nothing but overhead
+        s = link.strip()
+        q = s.find("?")
+        if q >= 0:
+            s = s[:q]
+        f = s.find("#")
+        if f >= 0:
+            s = s[:f]
+        return s.rstrip("/")
+
+    def _job_id(self, title: str, company: str, location: str, link: str) -> str:
+        # one join + one lower() pass (same string as lowering each part)
+        base = "|".join((title, company, location, self._normalize_link(link))).lower()
+        # 64-bit key: ample for per-day dedup, and cheaper than a 160-bit sha1
+        return hashlib.blake2b(base.encode("utf-8"), digest_size=8).hexdigest()
 
-        # ---- Build LinkedIn URL from env-driven filters ----
+    def _search_query(self, keywords: str, location: Optional[str]) -> str:
+        # ---- Build LinkedIn search query from env-driven filters ----
         exp_map = {
             "internship": "1",
             "entry_level": "2",
@@ -157,118 +247,150 @@ class ScrapeLinkedInTool(BaseTool):
         kw = quote_plus(keywords)
         loc_q = quote_plus(loc)
 
-        search_url = f"https://www.linkedin.com/jobs/search/?keywords={kw}&location={loc_q}&f_E={f_E}{f_TPR}"
-        print(f"[LinkedIn] GET {search_url}")
+        return f"keywords={kw}&location={loc_q}&f_E={f_E}{f_TPR}"
 
-        csv_path = self._daily_csv_path()
-        self._ensure_csv(csv_path)
-        existing_ids = self._load_existing_ids(csv_path)
+    def _search_url(self, keywords: str, location: Optional[str]) -> str:
+        return f"https://www.linkedin.com/jobs/search/?{self._search_query(keywords, location)}"
+
+    def _guest_api_url(self, keywords: str, location: Optional[str]) -> str:
+        # same filters; answers with just the card <li> fragment (no page shell, no JS)
+        return f"{self.GUEST_API_URL}?{self._search_query(keywords, location)}&start=0"
 
+    def _fetch_cards_http(self, keywords: str, location: Optional[str]) -> List[dict]:
+        """
+        Primary path: one GET to LinkedIn's public guest jobs API. [] when blocked or empty.
+        """
+        fragment = fetch_search_page(self._guest_api_url(keywords, location))
+        return parse_cards(fragment) if fragment else []
+
+    def _fetch_cards_selenium(self, search_url: str) -> Optional[List[dict]]:
+        """
+        Fallback path: render the page in headless Firefox. None if no WebDriver.
+        """
+        driver = acquire_webdriver()
+        if not driver:
+            return None
         try:
             driver.get(search_url)
-            # give time for LinkedIn to render the job results (headless)
-            time.sleep(3)
 
             # (optional) handle cookie/consent here if needed
 
+            # poll (every 0.5s, up to 15s) until the document is loaded and cards rendered
             WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "jobs-search__results-list"))
+                lambda d: d.execute_script("return document.readyState") == "complete"
+                and d.find_elements(By.CLASS_NAME, "base-card")
             )
 
-            soup = BeautifulSoup(driver.page_source, "lxml")
-            cards = soup.find_all("div", class_="base-card")
+            # same precompiled lxml XPath parser as the HTTP path
+            return parse_cards(driver.page_source)
+        finally:
+            release_webdriver(driver)
 
-            today_str = date.today().isoformat()
-            to_append, to_return = [], []
+    # ----------------------------
+    # Main run (guest API over HTTP first, pooled Firefox via acquire_webdriver as fallback)
+    # ----------------------------
+    def _run(self, keywords: str, location: Optional[str] = None) -> str:
+        """
+        JSON return format:
+        {
+          "ok": true,
+          "csv_path": "<.../data/jobs_YYYY-MM-DD.csv>",
+          "appended": <int>,
+          "jobs": [ {<full CSV-schema row>}, ... ]   # only new rows
+        }
+        """
+        search_url = self._search_url(keywords, location)
+        print(f"[LinkedIn] GET {search_url}")
 
-            # title heuristics (belt & suspenders)
-            intern_re = re.compile(r"\b(intern|internship|co[-\s]?op|coop|new\s*grad)\b", re.I)
-            entry_re  = re.compile(r"\b(entry[-\s]?level|junior|graduate)\b", re.I)
-            assoc_re  = re.compile(r"\b(associate)\b", re.I)
-            exclude_re= re.compile(r"\b(senior|sr\.?|lead|principal|staff|director|vp|head|chief|architect)\b", re.I)
+        csv_path = self._daily_csv_path()
+        self._ensure_csv(csv_path)
+        # Bloom sidecar answers "new job?" without loading every id; the exact
+        # set is only read when the filter reports a (possibly false) hit.
+        try:
+            bloom = self._load_id_bloom(csv_path)
+        except OSError as e:
+            print(f"[LinkedIn] Bloom filter unavailable ({e}); using exact id set.")
+            bloom = None
+        existing_ids = None
 
-            for c in cards:
-                title_elem = c.find("h3", class_="base-search-card__title")
-                company_elem = c.find("h4", class_="base-search-card__subtitle")
-                location_elem = c.find("span", class_="job-search-card__location")
-                link_elem = c.find("a", class_="base-card__full-link")
-                if not all([title_elem, company_elem, location_elem, link_elem]):
-                    continue
+        try:
+            # The guest API returns the card HTML directly; only start a
+            # browser when LinkedIn blocks the plain request or returns nothing.
+            cards = self._fetch_cards_http(keywords, location)
+            if not cards:
+                print("[LinkedIn] Guest API returned no cards; falling back to Selenium.")
+                cards = self._fetch_cards_selenium(search_url)
+                if cards is None:
+                    return dumps({"ok": False, "error": "WebDriver not available."})
 
-                title = title_elem.text.strip()
-                company = company_elem.text.strip()
-                loc_txt = location_elem.text.strip()
-                link = (link_elem.get("href") or "").strip()
+            today_str = date.today().isoformat()
+            to_append, to_return = [], []
+            seen = set()   # same posting rendered twice on one page (sponsored + organic)
 
-                # safety filter
-                t = title.lower()
-                if exclude_re.search(t):
+            for c in cards:
+                title = c["title"]
+                company = c["company"]
+                loc_txt = c["location"]
+                link = c["link"]
+
+                # safety filter: an exclusion anywhere in the title wins over other hits
+                kinds = {m.lastgroup for m in self.TITLE_RE.finditer(title)}
+                if "excl" in kinds:
                     continue
-
-                if intern_re.search(t):
-                    seniority = "Internship"
-                elif entry_re.search(t):
-                    seniority = "Entry"
-                elif assoc_re.search(t):
-                    seniority = "Associate"
-                else:
-                    # If title unclear, trust f_E filter and default to Associate
-                    seniority = "Associate"
+                seniority = next((s for g, s in self.SENIORITY_BY_GROUP if g in kinds), "Associate")
 
                 jid = self._job_id(title, company, loc_txt, link)
-                if jid in existing_ids:
+                if jid in seen:
                     continue
-
-                row = {
-                    "job_id": jid,
-                    "date_scraped": today_str,
-                    "title": title,
-                    "company": company,
-                    "location": loc_txt,
-                    "link": link,
-                    "source": "LinkedIn",
-                    "raw_description": "",
-                    "keywords_matched": keywords,
-                    # workflow defaults
-                    "resume_customized": "no",
-                    "ats_score_checked": "no",
-                    "ats_score": "",
-                    "approved_for_application": "no",
-                    "application_submitted": "no",
-                    "resume_id_used": "",
-                    "date_applied": "",
-                    # enrichment placeholders
-                    "seniority_level": seniority,
-                    "employment_type": "",
-                    "salary_range": "",
-                    "skills_extracted": "",
-                }
+                seen.add(jid)
+                if bloom is None or jid in bloom:
+                    if existing_ids is None:
+                        existing_ids = self._load_existing_ids(csv_path)
+                    if jid in existing_ids:
+                        continue
+
+                row = JobRow(
+                    job_id=jid,
+                    date_scraped=today_str,
+                    title=title,
+                    company=company,
+                    location=loc_txt,
+                    link=link,
+                    keywords_matched=keywords,
+                    seniority_level=seniority,
+                )
 
                 to_append.append(row)
                 to_return.append(row)
 
             if to_append:
-                with open(csv_path, "a", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
+                size_before, st = self._append_rows(csv_path, to_append)
+                if bloom is not None:
                     for r in to_append:
-                        writer.writerow(r)
+                        bloom.add(r.job_id)
+                    # covered only advances if our rows directly followed what it covered
+                    if bloom.covered == size_before:
+                        bloom.covered = st.st_size
+                    bloom.save(bloom_path(csv_path))
+                cached = self._id_cache.get(csv_path)
+                # extend the memo only if nobody else appended since the ids were loaded
+                if cached is not None and cached[1] == size_before:
+                    self._id_cache[csv_path] = (
+                        st.st_mtime_ns, st.st_size, cached[2].union(r.job_id for r in to_append)
+                    )
 
             print(f"[LinkedIn] levels={APP_CONFIG.DESIRED_EXPERIENCE_LEVELS}, posted_within={getattr(APP_CONFIG,'POSTED_WITHIN_DAYS',0)}d — appended {len(to_append)} → {csv_path}")
 
-            return json.dumps({
+            # JobRow -> dict only here, at the JSON boundary
+            return dumps({
                 "ok": True,
                 "csv_path": csv_path,
                 "appended": len(to_append),
                 "jobs": to_return
-            }, ensure_ascii=False)
+            })
 
         except Exception as e:
-            return json.dumps({"ok": False, "error": f"LinkedIn scrape error: {e}"})
-        finally:
-            try:
-                driver.quit()
-            except Exception:
-                pass
+            return dumps({"ok": False, "error": f"LinkedIn scrape error: {e}"})
 
     def _arun(self, *args, **kwargs):
         raise NotImplementedError("This tool does not support async")
@@ -0,0 +1,86 @@
+"""
+tools/skills.py
+Dictionary-based skill matching for job titles/descriptions.
+One pass over the text via an Aho-Corasick automaton (pyahocorasick, C) when
+installed; otherwise a single precompiled regex alternation.
+"""
+import re
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup
+    ahocorasick = None
+
+# canonical name -> extra spellings (matched case-insensitively, whole words)
+SKILLS = {
+    "Python": [], "R": [], "SQL": [], "NoSQL": [], "Java": [], "Scala": [], "Golang": [],
+    "C++": [], "C#": [], "JavaScript": [], "TypeScript": [], "Bash": ["shell scripting"],
+    "SAS": [], "SPSS": [], "MATLAB": [], "Julia": [],
+    "PostgreSQL": ["postgres"], "MySQL": [], "SQL Server": ["mssql", "t-sql", "tsql"],
+    "Oracle": [], "MongoDB": [], "Redis": [], "Snowflake": [], "BigQuery": [],
+    "Redshift": [], "Databricks": [], "Spark": ["pyspark", "apache spark"], "Hadoop": [],
+    "Hive": [], "Kafka": [], "Airflow": [], "dbt": [], "ETL": ["elt"],
+    "Pandas": [], "NumPy": [], "SciPy": [], "scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": [], "Keras": [], "PyTorch": [], "XGBoost": [], "LightGBM": [],
+    "Hugging Face": ["huggingface", "transformers"], "LangChain": [], "OpenCV": [],
+    "NLP": ["natural language processing"], "Computer Vision": [], "LLM": ["llms", "large language models"],
+    "Machine Learning": ["ml"], "Deep Learning": [], "Statistics": ["statistical analysis"],
+    "A/B Testing": ["ab testing", "a/b tests"], "Time Series": ["forecasting"],
+    "Data Visualization": ["data viz"], "Tableau": [], "Power BI": ["powerbi"], "Looker": [],
+    "Microsoft Excel": ["ms excel", "excel vba"], "Matplotlib": [], "Seaborn": [], "Plotly": [],
+    "Streamlit": [], "Flask": [], "FastAPI": [],
+    "AWS": ["amazon web services"], "Azure": [], "GCP": ["google cloud"], "SageMaker": [],
+    "Docker": [], "Kubernetes": ["k8s"], "Git": ["github", "gitlab"], "Linux": [],
+    "MLOps": [], "CI/CD": [], "REST API": ["rest apis", "restful"],
+}
+
+_ALIASES = {}
+for _canon, _extra in SKILLS.items():
+    for _alias in [_canon, *_extra]:
+        _ALIASES[_alias.lower()] = _canon
+
+# characters that glue a match to its neighbours (so "r" in "r&d" or "sql" in "mysql" is skipped)
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_+#&")
+
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _alias, _canon in _ALIASES.items():
+        _AUTOMATON.add_word(_alias, (len(_alias), _canon))
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+    # longest aliases first so "sql server" wins over "sql"
+    _SKILLS_RE = re.compile(
+        r"(?<![\w+#&])(" + "|".join(re.escape(a) for a in sorted(_ALIASES, key=len, reverse=True)) + r")(?![\w+#&])"
+    )
+
+
+def extract_skills(text: str) -> list[str]:
+    """
+    Return canonical skill names found in text, in order of first appearance.
+    """
+    if not text:
+        return []
+    low = text.lower()
+    found = {}
+    if _AUTOMATON is not None:
+        n = len(low)
+        hits = []
+        for end, (length, canon) in _AUTOMATON.iter(low):
+            start = end - length + 1
+            if start > 0 and low[start - 1] in _WORD_CHARS:
+                continue
+            if end + 1 < n and low[end + 1] in _WORD_CHARS:
+                continue
+            hits.append((start, -length, canon))
+        # leftmost-longest, non-overlapping (same result as the regex path)
+        covered = -1
+        for start, neg_len, canon in sorted(hits):
+            if start <= covered:
+                continue
+            covered = start - neg_len - 1
+            found.setdefault(canon, start)
+    else:
+        for m in _SKILLS_RE.finditer(low):
+            found.setdefault(_ALIASES[m.group(1)], m.start())
+    return sorted(found, key=found.get)
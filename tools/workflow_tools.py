@@ -5,11 +5,12 @@
 
 from crewai.tools import BaseTool
 from config import APP_CONFIG
+from tools.jobs_csv import csv_value, open_locked, padded_writer, update_in_place
+from tools.json_utils import dumps, loads
 
 import os
 import csv
-import json
-import glob
+import operator
 import tempfile
 from datetime import date as _date
 
@@ -28,6 +29,9 @@ except Exception:
 
 UPDATABLE_FIELDS = set(CSV_FIELDS) - {"job_id","date_scraped","title","company","location","link","source"}
 
+# row dict -> tuple in CSV_FIELDS order (one C call instead of a per-field dict build)
+_row_cols = operator.itemgetter(*CSV_FIELDS)
+
 def _bool_to_yesno(v):
     if isinstance(v, bool):
         return "yes" if v else "no"
@@ -49,32 +53,92 @@ def _csv_for_date(date_str: str):
 def _today_csv():
     return _csv_for_date(_date.today().isoformat())
 
+# newest jobs_*.csv, reused while the data dir's mtime is unchanged (no file added/removed;
+# the .idx/.bloom sidecars are kept in a subdirectory so their rewrites don't count)
+_LATEST_CACHE = {"dir_mtime": None, "path": None}
+
 def _latest_csv():
-    files = sorted(glob.glob(os.path.join(_data_dir(), "jobs_*.csv")))
-    return files[-1] if files else None
+    data_dir = _data_dir()
+    mtime = os.stat(data_dir).st_mtime_ns
+    if mtime == _LATEST_CACHE["dir_mtime"]:
+        return _LATEST_CACHE["path"]
+    # single pass for the max name (ISO dates sort lexically); no list, no sort
+    with os.scandir(data_dir) as it:
+        best = max(
+            (e.name for e in it if e.name.startswith("jobs_") and e.name.endswith(".csv")),
+            default=None,
+        )
+    path = os.path.join(data_dir, best) if best else None
+    _LATEST_CACHE.update(dir_mtime=mtime, path=path)
+    return path
 
 def _read_all(path: str):
     rows = []
     if not os.path.exists(path): return rows
     with open(path, "r", newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
+        last = reader.fieldnames[-1] if reader.fieldnames else None
         for r in reader:
+            if r.get(last):
+                r[last] = r[last].rstrip(" ")   # record padding (see tools/jobs_csv.py)
             rows.append(r)
     return rows
 
+def _row_tuple(r: dict):
+    try:
+        return _row_cols(r)
+    except KeyError:  # row missing columns (older header): fill them in, as before
+        for k in CSV_FIELDS:
+            r.setdefault(k, "")
+        return _row_cols(r)
+
 def _write_all_atomic(path: str, rows):
     dir_ = os.path.dirname(path)
     os.makedirs(dir_, exist_ok=True)
     with tempfile.NamedTemporaryFile("w", dir=dir_, delete=False, newline="", encoding="utf-8") as tmp:
-        writer = csv.DictWriter(tmp, fieldnames=CSV_FIELDS)
-        writer.writeheader()
-        for r in rows:
-            for k in CSV_FIELDS:
-                r.setdefault(k, "")
-            writer.writerow({k: r.get(k, "") for k in CSV_FIELDS})
+        csv.writer(tmp).writerow(CSV_FIELDS)
+        # rows padded again, so later updates of them can go in place
+        padded_writer(tmp).writerows(map(_row_tuple, rows))
         tmp_path = tmp.name
     os.replace(tmp_path, path)
 
+def _update_full(path: str, updates: dict):
+    """
+    Fallback for update_in_place: read every row, apply {job_id: fields}, rewrite.
+    Returns ({job_id: row}, [job_ids not found]).
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"No rows in CSV: {path}")
+    # locked from read to replace so a concurrent append is not lost (released on close)
+    with open_locked(path, "rb"):
+        rows = _read_all(path)
+        if not rows:
+            raise ValueError(f"No rows in CSV: {path}")
+        by_id = {r.get("job_id"): r for r in rows}
+        found, not_found = {}, []
+        for job_id, fields in updates.items():
+            target = by_id.get(job_id)
+            if target is None:
+                not_found.append(job_id)
+                continue
+            target.update((k, csv_value(v)) for k, v in fields.items())
+            found[job_id] = target
+        if found:
+            try:
+                _write_all_atomic(path, rows)
+            except Exception as e:
+                raise OSError(f"Failed to write CSV: {e}") from e
+    return found, not_found
+
+def _apply_updates(path: str, updates: dict):
+    """Overwrite only the touched records when they fit; otherwise rewrite the file."""
+    try:
+        done = update_in_place(path, updates)
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"[UpdateJobsCsv] in-place update failed ({e}); rewriting {path}")
+        done = None
+    return done if done is not None else _update_full(path, updates)
+
 class UpdateJobsCsvTool(BaseTool):
     """
     Update workflow/status fields in jobs_YYYY-MM-DD.csv by job_id.
@@ -100,11 +164,35 @@ class UpdateJobsCsvTool(BaseTool):
       "args": { ... }                  # optional extra args for action
     }
 
+    BATCH INPUT (JSON string) — one CSV read/write for all jobs:
+    {
+      "batch": {
+        "<job_id>": { "skills_extracted": "...", "seniority_level": "..." },
+        ...
+      },
+      "date": "YYYY-MM-DD"             # optional, as above
+    }
+    or, to use actions per job, a list (results then also carry each full "row"):
+    {
+      "batch": [
+        { "job_id": "...", "updates": {...}, "action": "...", "args": {...} },
+        ...
+      ]
+    }
+
     OUTPUT (JSON):
     { "ok": true, "csv_path": "...", "updated_fields": {...}, "row": {...} }
+    BATCH OUTPUT (JSON):
+    { "ok": true, "csv_path": "...", "results": [{"job_id": "...", "updated_fields": {...}}, ...],
+      "not_found": ["<job_id>", ...] }
     """
     name: str = "Update Jobs CSV"
-    description: str = "Update workflow/status fields for a job row in the daily CSV by job_id. Returns JSON."
+    description: str = (
+        "Update workflow/status fields for job rows in the daily CSV. "
+        "Pass {\"batch\": {job_id: updates}} (or a list of {job_id, updates, action, args}) "
+        "to update many jobs in one call, "
+        "or {\"job_id\": ..., \"updates\": {...}} for a single job. Returns JSON."
+    )
 
     def _resolve_csv_path(self, date_str: str | None):
         if date_str:
@@ -134,27 +222,8 @@ class UpdateJobsCsvTool(BaseTool):
                 updates["ats_score"] = args["ats_score"]
             updates.setdefault("ats_score_checked", "yes")
 
-    def _run(self, json_payload: str) -> str:
-        try:
-            payload = json.loads(json_payload)
-        except Exception:
-            return json.dumps({"ok": False, "error": "Input must be a JSON string."})
-
-        job_id = payload.get("job_id")
-        if not job_id:
-            return json.dumps({"ok": False, "error": "Missing 'job_id'."})
-
-        csv_path = self._resolve_csv_path(payload.get("date"))
-        if not csv_path:
-            return json.dumps({"ok": False, "error": "No CSV found for the given date, and no prior CSVs exist."})
-
-        rows = _read_all(csv_path)
-        if not rows:
-            return json.dumps({"ok": False, "error": f"No rows in CSV: {csv_path}"})
-
-        updates = payload.get("updates", {}) or {}
-        action = payload.get("action")
-        args = payload.get("args", {}) or {}
+    def _sanitize(self, updates: dict, action: str | None, args: dict | None) -> dict:
+        updates = dict(updates or {})
         if action:
             self._apply_action(action, updates, args)
 
@@ -167,29 +236,90 @@ class UpdateJobsCsvTool(BaseTool):
         # auto-fill date_applied if submitting
         if sanitized.get("application_submitted") == "yes" and not sanitized.get("date_applied"):
             sanitized["date_applied"] = _date.today().isoformat()
+        return sanitized
 
-        target = None
-        for r in rows:
-            if r.get("job_id") == job_id:
-                target = r
-                break
+    def _run_batch(self, csv_path: str, batch: dict | list) -> str:
+        # all updates applied under one lock (in place) or one read/write (fallback)
+        with_rows = isinstance(batch, list)
+        if with_rows:
+            sanitized, bad_ids = {}, []
+            for item in batch:
+                if not isinstance(item, dict) or not item.get("job_id"):
+                    continue
+                if not isinstance(item["job_id"], str):
+                    bad_ids.append(item["job_id"])   # reported as not found
+                    continue
+                updates, action, args = item.get("updates"), item.get("action"), item.get("args")
+                fields = self._sanitize(
+                    updates if isinstance(updates, dict) else {},
+                    action if isinstance(action, str) else None,
+                    args if isinstance(args, dict) else None,
+                )
+                # repeated job_id: later entries win field by field
+                sanitized.setdefault(item["job_id"], {}).update(fields)
+        else:
+            sanitized = {
+                job_id: self._sanitize(updates if isinstance(updates, dict) else {}, None, None)
+                for job_id, updates in batch.items()
+            }
+            bad_ids = []
+        try:
+            found, not_found = _apply_updates(csv_path, sanitized)
+        except (OSError, ValueError) as e:
+            return dumps({"ok": False, "error": str(e), "csv_path": csv_path})
+        results = [{"job_id": j, "updated_fields": u} for j, u in sanitized.items() if j in found]
+        if with_rows:
+            for r in results:
+                r["row"] = found[r["job_id"]]
 
-        if target is None:
-            return json.dumps({"ok": False, "error": f"job_id not found: {job_id}", "csv_path": csv_path})
+        return dumps({
+            "ok": bool(results),
+            "csv_path": csv_path,
+            "results": results,
+            "not_found": not_found + bad_ids,
+        })
+
+    def _run(self, json_payload: str) -> str:
+        try:
+            payload = loads(json_payload)
+        except Exception:
+            return dumps({"ok": False, "error": "Input must be a JSON string."})
 
-        target.update(sanitized)
+        batch = payload.get("batch")
+        if batch is not None and not isinstance(batch, (dict, list)):
+            return dumps({"ok": False, "error": "'batch' must be {job_id: updates} or a list of {job_id, updates, action, args}."})
+
+        job_id = payload.get("job_id")
+        if not job_id and not batch:
+            return dumps({"ok": False, "error": "Missing 'job_id' (or 'batch')."})
+
+        csv_path = self._resolve_csv_path(payload.get("date"))
+        if not csv_path:
+            return dumps({"ok": False, "error": "No CSV found for the given date, and no prior CSVs exist."})
+
+        if batch:
+            return self._run_batch(csv_path, batch)
+
+        if not isinstance(job_id, str):
+            return dumps({"ok": False, "error": f"job_id not found: {job_id}", "csv_path": csv_path})
+
+        sanitized = self._sanitize(payload.get("updates"), payload.get("action"), payload.get("args"))
 
         try:
-            _write_all_atomic(csv_path, rows)
-        except Exception as e:
-            return json.dumps({"ok": False, "error": f"Failed to write CSV: {e}", "csv_path": csv_path})
+            found, _ = _apply_updates(csv_path, {job_id: sanitized})
+        except (OSError, ValueError) as e:
+            return dumps({"ok": False, "error": str(e), "csv_path": csv_path})
+
+        target = found.get(job_id)
+        if target is None:
+            return dumps({"ok": False, "error": f"job_id not found: {job_id}", "csv_path": csv_path})
 
-        return json.dumps({
+        return dumps({
             "ok": True,
             "csv_path": csv_path,
             "updated_fields": sanitized,
             "row": target
-        }, ensure_ascii=False)
+        })
 
     def _arun(self, *args, **kwargs):
         raise NotImplementedError("This tool does not support async")
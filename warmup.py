@@ -0,0 +1,67 @@
+# ==============================================================================
+# FILE: warmup.py
+# PURPOSE: Pay cold-start costs once, right after the LLM container starts:
+# - one tiny chat completion so TRT-LLM builds its CUDA graphs / caches
+# - import the heavy Python modules so .pyc files and the page cache are warm
+# USAGE: python warmup.py   (start_services.sh runs it after start-llm)
+# ==============================================================================
+import os
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_TELEMETRY_OPT_OUT", "1")
+
+import sys
+import time
+import asyncio
+import importlib
+import requests
+
+from config import APP_CONFIG
+from tools.llm_health import models_url, wait_online
+from tools.json_utils import dumpb
+
+HEAVY_MODULES = ("crewai", "selenium.webdriver", "lxml.etree", "agents", "tasks")
+
+# The engine can take a while to load after `docker run`; wait longer than main.py does.
+STARTUP_BACKOFF = (1, 2, 4, 8, 16, 30, 30)
+
+
+def warm_llm() -> bool:
+    payload = {
+        "model": "llama-2-7b-chat",
+        "messages": [{"role": "user", "content": "Ping"}],
+        "max_tokens": 4,
+    }
+    t0 = time.perf_counter()
+    try:
+        r = requests.post(APP_CONFIG.LLM_API_URL, data=dumpb(payload),
+                          headers={"Content-Type": "application/json"}, timeout=120)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        print(f"❌ Warm-up request failed: {e}")
+        return False
+    print(f"[warmup] first completion: HTTP {r.status_code} in {time.perf_counter() - t0:.1f}s")
+    return r.status_code == 200
+
+
+def warm_imports() -> None:
+    for name in HEAVY_MODULES:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[warmup] import {name} failed: {e}")
+            continue
+        print(f"[warmup] import {name}: {time.perf_counter() - t0:.2f}s")
+
+
+def main() -> int:
+    ok, last_error = asyncio.run(wait_online(models_url(APP_CONFIG.LLM_API_URL), backoff=STARTUP_BACKOFF))
+    if not ok:
+        print(f"❌ LLM server never came online: {last_error}")
+        return 1
+    llm_ok = warm_llm()
+    warm_imports()
+    return 0 if llm_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())